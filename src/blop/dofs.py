@@ -1,10 +1,13 @@
+import math
 import time as ttime
 import uuid
 import warnings
+import weakref
 from collections.abc import Iterable, Sequence
 from dataclasses import dataclass, field, fields
+from functools import cached_property
 from operator import attrgetter
-from typing import Tuple, Union
+from typing import Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -25,6 +28,25 @@ DOF_FIELD_TYPES = {
     "domain": "object",
 }
 
+# cached properties of a DOF, keyed by the fields they are derived from
+DOF_CACHED_PROPERTIES = {
+    "description": ["label_with_units"],
+    "units": ["label_with_units"],
+    "type": ["domain", "_trust_domain"],
+    "transform": ["domain", "_trust_domain"],
+    "search_domain": ["domain", "_trust_domain"],
+    "trust_domain": ["domain", "_trust_domain"],
+}
+
+# numeric fields of a DOF that a DOFList keeps as numpy columns
+DOF_COLUMN_DTYPES = {
+    "active": bool,
+    "read_only": bool,
+}
+
+# fields of a DOF that a DOFList caches values from, so changing one clears the cache of every list holding the DOF
+DOF_LIST_CACHED_FIELDS = {"name", "device", *DOF_COLUMN_DTYPES}
+
 DOF_TYPES = ["continuous", "binary", "ordinal", "categorical"]
 TRANSFORM_DOMAINS = {"log": (0.0, np.inf), "logit": (0.0, 1.0), "arctanh": (-1.0, 1.0)}
 
@@ -37,8 +59,11 @@ def _validate_dofs(dofs):
     dof_names = [dof.name for dof in dofs]
 
     # check that dof names are unique
-    unique_dof_names, counts = np.unique(dof_names, return_counts=True)
-    duplicate_dof_names = unique_dof_names[counts > 1]
+    seen_dof_names, duplicate_dof_names = set(), []
+    for name in dof_names:
+        if name in seen_dof_names:
+            duplicate_dof_names.append(name)
+        seen_dof_names.add(name)
     if len(duplicate_dof_names) > 0:
         raise ValueError(f"Duplicate name(s) in supplied dofs: {duplicate_dof_names}")
 
@@ -149,6 +174,33 @@ class DOF:
 
         return f"{self.__class__.__name__}({', '.join(nodef_f_repr)})"
 
+    def __setattr__(self, name, value):
+        # a DOF can't take a name that another DOF already has in one of our lists
+        if name == "name" and "_dof_lists" in self.__dict__:
+            for dof_list in self._dof_lists:
+                index = dof_list._name_index.get(value)
+                if (index is not None) and (dof_list.dofs[index] is not self):
+                    raise ValueError(f"Duplicate name(s) in supplied dofs: {[value]}")
+        object.__setattr__(self, name, value)
+        # forget any cached properties that depend on this field
+        if name in DOF_CACHED_PROPERTIES:
+            for prop in DOF_CACHED_PROPERTIES[name]:
+                self.__dict__.pop(prop, None)
+        # the lists holding this DOF only exist after __post_init__, so this is skipped during construction
+        if name in DOF_LIST_CACHED_FIELDS and "_dof_lists" in self.__dict__:
+            for dof_list in self._dof_lists:
+                dof_list._cache.clear()
+
+    def __getstate__(self):
+        # the lists that hold this DOF are weak references, which can't be pickled
+        state = self.__dict__.copy()
+        state.pop("_dof_lists", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__["_dof_lists"] = weakref.WeakSet()
+
     # Some post-processing. This is specific to dataclasses
     def __post_init__(self):
         if (self.name is None) ^ (self.device is None):
@@ -222,6 +274,11 @@ class DOF:
         # all dof degrees of freedom are hinted
         self.device.kind = "hinted"
 
+        self.model = None
+
+        # the DOFLists that hold this DOF, so that we can clear their caches when we change
+        self._dof_lists = weakref.WeakSet()
+
     @property
     def _search_domain(self):
         """
@@ -236,14 +293,14 @@ class DOF:
         else:
             return self.search_domain
 
-    @property
+    @cached_property
     def _trust_domain(self):
         """
         If trust_domain is None, then we return the total domain.
         """
         return self.trust_domain or self.domain
 
-    @property
+    @cached_property
     def domain(self):
         """
         The total domain; the user can't control this. This is what we fall back on as the trust_domain if none is supplied.
@@ -303,13 +360,14 @@ class DOF:
 
     @property
     def readback(self):
-        # there is probably a better way to do this
+        # signals give us their value directly, without building a whole reading
+        if isinstance(self.device, Signal):
+            return self.device.get()
         return self.device.read()[self.device.name]["value"]
 
-    @property
-    def summary(self) -> pd.Series:
-        series = pd.Series(index=list(DOF_FIELD_TYPES.keys()), dtype="object")
-        for attr in series.index:
+    def _summary_values(self) -> dict:
+        values = {}
+        for attr in DOF_FIELD_TYPES:
             value = getattr(self, attr)
             if attr in ["search_domain", "trust_domain", "domain"]:
                 if (self.type == "continuous") and not self.read_only and value is not None:
@@ -317,16 +375,20 @@ class DOF:
                         value = f"[{value[0]:.02e}, {value[1]:.02e}]"
                     else:
                         value = f"({value[0]:.02e}, {value[1]:.02e})"
-            series[attr] = value if value is not None else ""
-        return series
+            values[attr] = value if value is not None else ""
+        return values
 
     @property
+    def summary(self) -> pd.Series:
+        return pd.Series(self._summary_values(), index=list(DOF_FIELD_TYPES.keys()), dtype="object")
+
+    @cached_property
     def label_with_units(self) -> str:
         return f"{self.description}{f' [{self.units}]' if self.units else ''}"
 
     @property
     def has_model(self):
-        return hasattr(self, "model")
+        return self.model is not None
 
     def activate(self):
         self.active = True
@@ -336,43 +398,90 @@ class DOF:
 
 
 class DOFList(Sequence):
-    def __init__(self, dofs: list = []):
-        _validate_dofs(dofs)
+    def __init__(self, dofs: Optional[Sequence[DOF]] = None):
+        # keep our own list, so that the caller can't change it from under the cache
+        self._hold(_validate_dofs(dofs if dofs is not None else []))
+
+    def _hold(self, dofs: list):
+        """
+        Take an already-validated list of DOFs, and register with each of them so that they can clear our cache.
+        """
         self.dofs = dofs
+        self._cache = {}
+        for dof in dofs:
+            dof._dof_lists.add(self)
+
+    def _cached(self, key, compute):
+        """
+        Return a cached value derived from the DOFs, computing it if needed. The cache is cleared whenever a DOF is added,
+        or when one of our DOFs changes a field that the list caches.
+        """
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
 
     @property
     def names(self) -> list:
-        return [dof.name for dof in self.dofs]
+        # return a copy, so that callers can't change the cache
+        return list(self._cached("names", lambda: [dof.name for dof in self.dofs]))
 
     @property
     def devices(self) -> list:
-        return [dof.device for dof in self.dofs]
+        return list(self._cached("devices", lambda: [dof.device for dof in self.dofs]))
+
+    @property
+    def _name_index(self) -> dict:
+        return self._cached("name_index", self._build_name_index)
+
+    def _build_name_index(self) -> dict:
+        name_index = {dof.name: index for index, dof in enumerate(self.dofs)}
+        # names should be unique, but make sure the index doesn't silently drop a DOF if they aren't
+        if len(name_index) != len(self.dofs):
+            _validate_dofs(self.dofs)
+        return name_index
+
+    def _column(self, attr) -> np.ndarray:
+        """
+        Return a read-only array of some numeric field for each DOF.
+        """
+        column = self._cache.get(("column", attr))
+        if column is None:
+            column = self._compute_column(attr)
+            column.flags.writeable = False
+            self._cache[("column", attr)] = column
+        return column
+
+    def _compute_column(self, attr) -> np.ndarray:
+        return np.fromiter((getattr(dof, attr) for dof in self.dofs), dtype=DOF_COLUMN_DTYPES[attr], count=len(self))
 
     def __call__(self, *args, **kwargs):
         return self.subset(*args, **kwargs)
 
     def __getattr__(self, attr):
         # This is called if we can't find the attribute in the normal way.
+        if attr in DOF_COLUMN_DTYPES:
+            # the cached column is shared and read-only, so hand out a copy that the caller is free to change
+            return self._column(attr).copy()
         if all([hasattr(dof, attr) for dof in self.dofs]):
             if DOF_FIELD_TYPES.get(attr) in ["float", "int", "bool"]:
                 return np.array([getattr(dof, attr) for dof in self.dofs])
             return [getattr(dof, attr) for dof in self.dofs]
-        if attr in self.names:
+        if attr in self._name_index:
             return self.__getitem__(attr)
 
         raise AttributeError(f"DOFList object has no attribute named '{attr}'.")
 
     def __getitem__(self, key):
-        if isinstance(key, str):
-            if key not in self.names:
+        if isinstance(key, (int, np.integer)):
+            return self.dofs[key]
+        elif isinstance(key, str):
+            if key not in self._name_index:
                 raise ValueError(f"DOFList has no DOF named {key}.")
-            return self.dofs[self.names.index(key)]
-        elif isinstance(key, Iterable):
-            return [self.dofs[_key] for _key in key]
+            return self.dofs[self._name_index[key]]
         elif isinstance(key, slice):
-            return [self.dofs[i] for i in range(*key.indices(len(self)))]
-        elif isinstance(key, int):
             return self.dofs[key]
+        elif isinstance(key, Iterable):
+            return [self.dofs[_key] for _key in key]
         else:
             raise ValueError(f"Invalid index {key}.")
 
@@ -420,11 +529,9 @@ class DOFList(Sequence):
 
     @property
     def summary(self) -> pd.DataFrame:
-        table = pd.DataFrame(columns=list(DOF_FIELD_TYPES.keys()), index=self.names)
-
-        for dof in self.dofs:
-            for attr, value in dof.summary.items():
-                table.at[dof.name, attr] = value
+        # build the table in one go, rather than assigning it cell by cell
+        rows = [dof._summary_values() for dof in self.dofs]
+        table = pd.DataFrame(rows, index=self.names, columns=list(DOF_FIELD_TYPES.keys()))
 
         for attr, dtype in DOF_FIELD_TYPES.items():
             table[attr] = table[attr].astype(dtype)
@@ -446,61 +553,92 @@ class DOFList(Sequence):
         return np.array([dof._trust_domain for dof in self.dofs])
 
     def add(self, dof):
-        _validate_dofs([*self.dofs, dof])
+        # the existing dofs are already validated, so we only need to check the new name
+        if dof.name in self._name_index:
+            raise ValueError(f"Duplicate name(s) in supplied dofs: {[dof.name]}")
         self.dofs.append(dof)
+        dof._dof_lists.add(self)
+        self._cache.clear()
 
-    @staticmethod
-    def _test_dof(dof, type=None, active=None, read_only=None, tag=None):
+    def _subset_mask(self, type=None, active=None, read_only=None, tag=None) -> np.ndarray:
+        """
+        Return a boolean array of which DOFs satisfy all of the supplied criteria.
+        """
+        n = len(self.dofs)
+        mask = np.ones(n, dtype=bool)
         if type is not None:
-            if dof.type != type:
-                return False
+            mask &= np.fromiter((dof.type == type for dof in self.dofs), dtype=bool, count=n)
         if active is not None:
-            if dof.active != active:
-                return False
+            mask &= self._column("active") == active
         if read_only is not None:
-            if dof.read_only != read_only:
-                return False
+            mask &= self._column("read_only") == read_only
         if tag is not None:
-            if not np.isin(np.atleast_1d(tag), dof.tags).any():
-                return False
-        return True
+            tags = {tag} if isinstance(tag, str) else set(np.atleast_1d(tag).tolist())
+            mask &= np.fromiter((not tags.isdisjoint(dof.tags) for dof in self.dofs), dtype=bool, count=n)
+        return mask
 
     def subset(self, type=None, active=None, read_only=None, tag=None):
-        return DOFList(
-            [dof for dof in self.dofs if self._test_dof(dof, type=type, active=active, read_only=read_only, tag=tag)]
-        )
+        mask = self._subset_mask(type=type, active=active, read_only=read_only, tag=tag)
+        return DOFListView(self, np.flatnonzero(mask))
 
     def activate(self, **subset_kwargs):
-        for dof in self.dofs:
-            if self._test_dof(dof, **subset_kwargs):
-                dof.active = True
+        for i in np.flatnonzero(self._subset_mask(**subset_kwargs)):
+            self.dofs[i].active = True
 
     def deactivate(self, **subset_kwargs):
-        for dof in self.dofs:
-            if self._test_dof(dof, **subset_kwargs):
-                dof.active = False
+        for i in np.flatnonzero(self._subset_mask(**subset_kwargs)):
+            self.dofs[i].active = False
 
     def activate_only(self, **subset_kwargs):
-        for dof in self.dofs:
-            if self._test_dof(dof, **subset_kwargs):
-                dof.active = True
-            else:
-                dof.active = False
+        for dof, selected in zip(self.dofs, self._subset_mask(**subset_kwargs)):
+            dof.active = bool(selected)
 
     def deactivate_only(self, **subset_kwargs):
-        for dof in self.dofs:
-            if self._test_dof(dof, **subset_kwargs):
-                dof.active = False
-            else:
-                dof.active = True
+        for dof, selected in zip(self.dofs, self._subset_mask(**subset_kwargs)):
+            dof.active = not selected
+
+
+class DOFListView(DOFList):
+    """
+    A subset of a DOFList. The DOFs were validated by the parent, and numeric columns are read from the parent's cache.
+    """
+
+    def __init__(self, parent: DOFList, index: np.ndarray):
+        self._parent = parent
+        self._index = index
+        # the parent already validated these DOFs, so there's no need to do it again
+        self._hold([parent.dofs[i] for i in index])
+
+    def _compute_column(self, attr) -> np.ndarray:
+        if self._parent is None:
+            return super()._compute_column(attr)
+        return self._parent._column(attr)[self._index]
+
+    def add(self, dof):
+        super().add(dof)
+        # we no longer line up with the parent, so from now on we act as a normal DOFList
+        self._parent = None
 
 
 class BrownianMotion(SignalRO):
     """
     Read-only degree of freedom simulating brownian motion
+
+    Parameters
+    ----------
+    name: str, optional
+        The name of the signal. If not supplied, a random name is generated.
+    theta: float
+        How much the motion remembers its previous value after one second.
+    seed: int or numpy.random.Generator, optional
+        A seed for the random noise. Each signal draws from its own generator, so seeding numpy's
+        global random state does not affect it; pass a seed to make the readbacks reproducible.
     """
 
-    def __init__(self, name=None, theta=0.95, *args, **kwargs):
+    # how many normal samples to draw from the generator at a time
+    _noise_batch_size = 1024
+
+    def __init__(self, name=None, theta=0.95, *args, seed=None, **kwargs):
         name = name if name is not None else str(uuid.uuid4())
 
         super().__init__(name=name, *args, **kwargs)
@@ -509,10 +647,22 @@ class BrownianMotion(SignalRO):
         self.old_t = ttime.monotonic()
         self.old_y = 0.0
 
+        self._rng = np.random.default_rng(seed)
+        self._noise = np.empty(0)
+        self._noise_index = 0
+
+    def _standard_normal(self) -> float:
+        if self._noise_index >= len(self._noise):
+            self._noise = self._rng.standard_normal(self._noise_batch_size)
+            self._noise_index = 0
+        z = float(self._noise[self._noise_index])
+        self._noise_index += 1
+        return z
+
     def get(self):
         new_t = ttime.monotonic()
         alpha = self.theta ** (new_t - self.old_t)
-        new_y = alpha * self.old_y + np.sqrt(1 - alpha**2) * np.random.standard_normal()
+        new_y = alpha * self.old_y + math.sqrt(1 - alpha * alpha) * self._standard_normal()
 
         self.old_t = new_t
         self.old_y = new_y
@@ -1,6 +1,9 @@
+import pickle
+
+import numpy as np
 import pytest  # noqa F401
 
-from blop.dofs import DOF, DOFList
+from blop.dofs import DOF, BrownianMotion, DOFList
 
 
 def test_dof_types():
@@ -28,3 +31,247 @@ def test_dof_types():
     )
 
     dofs = DOFList([dof1, dof2, dof3, dof4])  # noqa
+
+
+def test_dof_list_summary():
+    dofs = DOFList(
+        [
+            DOF(name="x1", search_domain=(0, 5), units="mm", tags=["motor"]),
+            DOF(name="x2", search_domain={"in", "out"}, active=False),
+        ]
+    )
+
+    summary = dofs.summary
+    assert list(summary.index) == ["x1", "x2"]
+    assert summary.loc["x1", "units"] == "mm"
+    assert summary.loc["x1", "search_domain"] == "[0.00e+00, 5.00e+00]"
+    assert summary["active"].dtype == bool
+    assert not summary.loc["x2", "active"]
+
+    assert len(DOFList([]).summary) == 0
+
+
+def test_dof_list_add():
+    dofs = DOFList([DOF(name="x1", search_domain=(0, 5))])
+    assert dofs.names == ["x1"]
+    assert dofs["x1"] is dofs[0]
+
+    dofs.add(DOF(name="x2", search_domain=(0, 5)))
+    assert dofs.names == ["x1", "x2"]
+    assert dofs["x2"] is dofs.x2 is dofs[1]
+    assert len(dofs.devices) == 2
+
+    with pytest.raises(ValueError):
+        dofs.add(DOF(name="x1", search_domain=(0, 5)))
+    assert dofs.names == ["x1", "x2"]
+
+
+def test_dof_list_subset():
+    dofs = DOFList(
+        [
+            DOF(name="x1", search_domain=(0, 5), tags=["motor"]),
+            DOF(name="x2", search_domain=(0, 5), tags=["motor", "fine"], active=False),
+            DOF(name="x3", search_domain={"in", "out"}, tags=["filter"]),
+        ]
+    )
+
+    assert dofs.subset(active=True).names == ["x1", "x3"]
+    assert dofs.subset(type="continuous").names == ["x1", "x2"]
+    assert dofs.subset(tag="motor").names == ["x1", "x2"]
+    assert dofs.subset(tag=["fine", "filter"]).names == ["x2", "x3"]
+    assert dofs.subset(tag="motor", active=True).names == ["x1"]
+    assert dofs.subset(read_only=True).names == []
+
+    dofs.activate_only(tag="fine")
+    assert list(dofs.active) == [False, True, False]
+    dofs.activate(type="continuous")
+    assert list(dofs.active) == [True, True, False]
+
+
+def test_duplicate_dof_names():
+    with pytest.raises(ValueError):
+        DOFList([DOF(name="x1", search_domain=(0, 5)), DOF(name="x1", search_domain=(0, 1))])
+
+
+def test_dof_label_with_units():
+    dof = DOF(name="x1", description="The first DOF", search_domain=(0, 5), units="mm")
+    assert dof.label_with_units == "The first DOF [mm]"
+
+    dof.units = "deg"
+    assert dof.label_with_units == "The first DOF [deg]"
+
+    dof.units = None
+    dof.description = "x"
+    assert dof.label_with_units == "x"
+
+
+def test_dof_list_copies_input():
+    dof_list = [DOF(name="x1", search_domain=(0, 5))]
+    dofs = DOFList(dof_list)
+    dof_list.append(DOF(name="x2", search_domain=(0, 5)))
+    assert dofs.names == ["x1"]
+
+    empty_dofs = DOFList()
+    empty_dofs.add(DOF(name="x1", search_domain=(0, 5)))
+    assert len(DOFList()) == 0
+
+
+def test_dof_list_indexing():
+    dofs = DOFList([DOF(name=f"x{i}", search_domain=(0, 5)) for i in range(4)])
+
+    assert dofs[np.int64(1)] is dofs[1] is dofs["x1"]
+    assert dofs[1:3] == [dofs[1], dofs[2]]
+    assert dofs[np.array([0, 3])] == [dofs[0], dofs[3]]
+
+    with pytest.raises(ValueError):
+        dofs["x5"]
+
+
+def test_dof_list_columns():
+    dofs = DOFList(
+        [
+            DOF(name="x1", search_domain=(0, 5), travel_expense=2),
+            DOF(name="x2", search_domain=(0, 5), active=False),
+        ]
+    )
+    subset = dofs.subset(type="continuous")
+
+    assert list(dofs.active) == [True, False]
+    assert dofs.travel_expense == [2, 1]
+
+    # the columns we hand out are copies, so changing them doesn't touch the DOFs
+    active = dofs.active
+    active[1] = True
+    assert list(dofs.active) == [True, False]
+
+    # changing a DOF must be reflected in every list that holds it
+    dofs[1].activate()
+    assert list(dofs.active) == [True, True]
+    assert list(subset.active) == [True, True]
+    assert dofs.subset(active=True).names == ["x1", "x2"]
+
+    dofs.add(DOF(name="x3", search_domain=(0, 5), active=False))
+    assert list(dofs.active) == [True, True, False]
+
+
+def test_dof_list_view():
+    dofs = DOFList([DOF(name=f"x{i}", search_domain=(0, 5), active=(i % 2 == 0)) for i in range(5)])
+
+    active_dofs = dofs.subset(active=True)
+    assert active_dofs.names == ["x0", "x2", "x4"]
+    assert list(active_dofs.read_only) == [False, False, False]
+    assert active_dofs["x2"] is dofs["x2"]
+    assert active_dofs.subset(tag="nonexistent").names == []
+
+    dofs["x2"].deactivate()
+    assert list(active_dofs.active) == [True, False, True]
+    assert active_dofs.subset(active=True).names == ["x0", "x4"]
+
+    active_dofs.add(DOF(name="x5", search_domain=(0, 5)))
+    assert list(active_dofs.active) == [True, False, True, True]
+    assert len(dofs) == 5
+
+
+def test_dof_domain_follows_fields():
+    dof = DOF(name="x1", search_domain=(1, 5), trust_domain=(0.5, 10))
+    assert dof.domain == (-np.inf, np.inf)
+    assert dof._trust_domain == (0.5, 10)
+
+    dof.transform = "log"
+    assert dof.domain == (0.0, np.inf)
+
+    dof.trust_domain = None
+    assert dof._trust_domain == (0.0, np.inf)
+
+
+def test_dof_list_columns_are_per_list():
+    dofs = DOFList([DOF(name="x1", search_domain=(0, 5))])
+    other_dofs = DOFList([DOF(name="x2", search_domain=(0, 5))])
+    active = dofs._column("active")
+
+    # neither constructing nor changing an unrelated DOF should throw away our columns
+    DOF(name="x3", search_domain=(0, 5))
+    other_dofs[0].deactivate()
+    assert dofs._column("active") is active
+
+    dofs[0].deactivate()
+    assert list(dofs.active) == [False]
+
+
+def test_dof_pickle():
+    dofs = DOFList([DOF(name="x1", search_domain=(0, 5))])
+    dof = pickle.loads(pickle.dumps(dofs[0]))
+    assert dof.name == "x1"
+
+    new_dofs = DOFList([dof])
+    dof.deactivate()
+    assert list(new_dofs.active) == [False]
+
+
+def test_dof_list_names_stay_live():
+    dofs = DOFList([DOF(name=f"x{i}", search_domain=(0, 5)) for i in range(3)])
+
+    # the names we hand out are copies
+    dofs.names.append("bogus")
+    assert dofs.names == ["x0", "x1", "x2"]
+
+    # renaming a DOF is reflected in the list that holds it
+    dofs[0].name = "renamed"
+    assert dofs.names == ["renamed", "x1", "x2"]
+    assert dofs["renamed"] is dofs[0]
+    with pytest.raises(ValueError):
+        dofs["x0"]
+
+    # but not to a name that's already taken
+    with pytest.raises(ValueError):
+        dofs[1].name = "renamed"
+    assert dofs["renamed"] is dofs[0]
+
+    dofs[1].device = dofs[0].device
+    assert dofs.devices[1] is dofs[0].device
+
+
+def test_dof_list_view_columns():
+    dofs = DOFList([DOF(name=f"x{i}", search_domain=(0, 5)) for i in range(3)])
+    active_dofs = dofs.subset(active=True)
+
+    read_only = active_dofs._column("read_only")
+    assert active_dofs._column("read_only") is read_only
+    with pytest.raises(ValueError):
+        read_only[0] = True
+    assert active_dofs.read_only.flags.writeable
+
+    dofs[1].deactivate()
+    assert list(active_dofs.active) == [True, False, True]
+
+    active_dofs[0].name = "renamed"
+    assert active_dofs.names == ["renamed", "x1", "x2"]
+
+
+def test_brownian_motion_seed():
+    signals = [BrownianMotion(name=f"b{i}", seed=42) for i in range(2)]
+    samples = [[signal._standard_normal() for _ in range(3)] for signal in signals]
+    assert samples[0] == samples[1]
+    assert isinstance(BrownianMotion(name="b").get(), float)
+
+
+def test_dof_rename_to_duplicate_name():
+    dofs = DOFList([DOF(name="a", search_domain=(0, 5)), DOF(name="b", search_domain=(0, 5))])
+    active_dofs = dofs(active=True)
+
+    with pytest.raises(ValueError):
+        dofs[1].name = "a"
+
+    assert dofs[1].name == "b"
+    assert active_dofs.names == ["a", "b"]
+    assert dofs(active=True).names == ["a", "b"]
+
+
+def test_dof_list_name_index_collision():
+    dofs = DOFList([DOF(name="a", search_domain=(0, 5)), DOF(name="b", search_domain=(0, 5))])
+
+    # sneak a duplicate name past the checks in DOF.__setattr__
+    dofs[1].__dict__["name"] = "a"
+    dofs._cache.clear()
+    with pytest.raises(ValueError):
+        dofs["a"]